@@ -7,6 +7,7 @@ import time
 import logging
 import hashlib
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any
 from pathlib import Path
 
@@ -20,9 +21,9 @@ from demucs import separate
 from demucs import pretrained
 
 from .models import StemInfo, WebhookPayload
-from .security import get_webhook_headers
-from .s3 import upload_to_s3
+from .s3 import upload_to_s3, generate_presigned_get_url
 from .queues import celery_app
+from .webhook import deliver_webhook
 
 logger = logging.getLogger(__name__)
 
@@ -31,20 +32,22 @@ logger = logging.getLogger(__name__)
 def process_audio_split(
     self,
     version_id: str,
-    audio_url: str,
-    ai_model: str,
-    webhook: str,
-    correlation_id: str = None
+    file_key: str,
+    stem_types: List[str],
+    callback_url: str,
+    correlation_id: str = None,
+    model_name: str = "htdemucs"
 ) -> Dict[str, Any]:
     """
     Process audio separation using Demucs.
     
     Args:
         version_id: Unique version identifier
-        audio_url: Pre-signed URL to download audio
-        ai_model: Demucs model name
-        webhook: Webhook URL to call on completion
+        file_key: S3/R2 object key for the source audio file
+        stem_types: Stem types to upload (e.g. ["drums", "vocals"])
+        callback_url: Webhook URL to call on completion
         correlation_id: Optional correlation ID
+        model_name: Demucs model name
         
     Returns:
         Dictionary with job results
@@ -60,37 +63,40 @@ def process_audio_split(
         temp_dir = tempfile.mkdtemp(prefix="demucs_")
         logger.info(f"Created temp directory: {temp_dir}")
         
-        # Download audio file
+        # Download audio file via a presigned GET for the object key
         self.update_state(state="PROGRESS", meta={"status": "Downloading audio"})
+        audio_url = generate_presigned_get_url(file_key)
         audio_path = download_audio(audio_url, temp_dir)
         
         # Load Demucs model
         self.update_state(state="PROGRESS", meta={"status": "Loading model"})
-        model = load_demucs_model(ai_model)
+        model = load_demucs_model(model_name)
         
         # Separate audio
         self.update_state(state="PROGRESS", meta={"status": "Separating audio"})
         stems = separate_audio(model, audio_path, temp_dir)
         
-        # Upload stems to S3
+        # Upload requested stems to S3
         self.update_state(state="PROGRESS", meta={"status": "Uploading stems"})
-        stem_infos = upload_stems(stems, version_id)
+        requested = [path for path in stems if Path(path).stem in stem_types] or stems
+        stem_infos = upload_stems(requested, version_id)
         
         # Calculate processing time
         processing_time_ms = int((time.time() - start_time) * 1000)
         
         # Create webhook payload
         payload = WebhookPayload(
-            version_id=version_id,
+            job_id=self.request.id,
             status="completed",
-            processing_time_ms=processing_time_ms,
+            processing_time=processing_time_ms,
             stems=stem_infos,
             error=None
         )
         
-        # Send webhook
+        # Hand webhook delivery to the dedicated webhook_queue worker so the
+        # GPU worker is freed as soon as processing finishes
         self.update_state(state="PROGRESS", meta={"status": "Sending webhook"})
-        send_webhook(webhook, payload)
+        deliver_webhook.delay(callback_url, payload.model_dump())
         
         logger.info(f"Successfully processed version {version_id} in {processing_time_ms}ms")
         
@@ -110,13 +116,13 @@ def process_audio_split(
         # Send error webhook
         try:
             payload = WebhookPayload(
-                version_id=version_id,
+                job_id=self.request.id,
                 status="failed",
-                processing_time_ms=processing_time_ms,
+                processing_time=processing_time_ms,
                 stems=[],
                 error=error_msg
             )
-            send_webhook(webhook, payload)
+            deliver_webhook.delay(callback_url, payload.model_dump())
         except Exception as webhook_error:
             logger.error(f"Failed to send error webhook: {webhook_error}")
         
@@ -136,12 +142,19 @@ def process_audio_split(
             logger.info(f"Cleaned up temp directory: {temp_dir}")
 
 
+# A single S3 GET is capped at one backend stream; above this size the
+# download switches to concurrent byte-range GETs to fill the pipe
+_RANGE_THRESHOLD = 64 * 1024 * 1024
+_RANGE_CHUNK = 16 * 1024 * 1024
+_RANGE_WORKERS = 16
+
+
 def download_audio(audio_url: str, temp_dir: str) -> str:
     """Download audio file from URL to temporary directory."""
     try:
         response = requests.get(audio_url, stream=True, timeout=300)
         response.raise_for_status()
-        
+
         # Determine file extension from content type or URL
         content_type = response.headers.get('content-type', '')
         if 'audio/wav' in content_type:
@@ -152,21 +165,58 @@ def download_audio(audio_url: str, temp_dir: str) -> str:
             ext = '.flac'
         else:
             ext = '.wav'  # Default to WAV
-        
+
         audio_path = os.path.join(temp_dir, f"input{ext}")
-        
-        with open(audio_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-        
+
+        size = int(response.headers.get('content-length', 0))
+        if size > _RANGE_THRESHOLD and response.headers.get('accept-ranges') == 'bytes':
+            # Large object on a range-capable server (presigned S3 GETs
+            # always are): drop the single stream and fan out ranges
+            response.close()
+            download_ranges(audio_url, audio_path, size)
+        else:
+            # 1 MiB chunks and file buffer: 8 KB reads cap throughput and
+            # burn a syscall per chunk on audio-scale files
+            with open(audio_path, 'wb', buffering=1024 * 1024) as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+
         logger.info(f"Downloaded audio to {audio_path}")
         return audio_path
-        
+
     except Exception as e:
         logger.error(f"Failed to download audio: {e}")
         raise
 
 
+def download_ranges(audio_url: str, audio_path: str, size: int) -> None:
+    """Download a large object as concurrent byte-range GETs.
+
+    Each worker fetches one 16 MiB range and writes it at its offset in
+    the pre-sized output file, so the ranges land in place without any
+    reassembly pass.
+    """
+    with open(audio_path, 'wb') as f:
+        f.truncate(size)
+
+    def fetch_range(offset: int) -> None:
+        end = min(offset + _RANGE_CHUNK, size) - 1
+        response = requests.get(
+            audio_url,
+            headers={'Range': f'bytes={offset}-{end}'},
+            timeout=300
+        )
+        response.raise_for_status()
+        with open(audio_path, 'r+b') as f:
+            f.seek(offset)
+            f.write(response.content)
+
+    offsets = range(0, size, _RANGE_CHUNK)
+    with ThreadPoolExecutor(max_workers=min(_RANGE_WORKERS, len(offsets))) as executor:
+        # Drain the iterator so any worker's exception propagates
+        list(executor.map(fetch_range, offsets))
+
+
 def load_demucs_model(model_name: str):
     """Load Demucs model."""
     try:
@@ -221,10 +271,12 @@ def separate_audio(model, audio_path: str, temp_dir: str) -> List[str]:
 
 
 def upload_stems(stem_files: List[str], version_id: str) -> List[StemInfo]:
-    """Upload stem files to S3 and return stem information."""
-    stem_infos = []
-    
-    for stem_path in stem_files:
+    """Upload stem files to S3 concurrently and return stem information.
+
+    Uploads are I/O-bound, so the stems go out in parallel through the
+    shared (thread-safe) S3 client instead of one at a time.
+    """
+    def upload_one(stem_path: str) -> StemInfo:
         try:
             stem_name = Path(stem_path).stem
             stem_type = stem_name
@@ -242,8 +294,9 @@ def upload_stems(stem_files: List[str], version_id: str) -> List[StemInfo]:
             # Upload to S3
             s3_url = upload_to_s3(stem_path, f"{version_id}/{stem_name}.wav")
             
-            # Create stem info
-            stem_info = StemInfo(
+            logger.info(f"Uploaded stem {stem_name} to {s3_url}")
+            
+            return StemInfo(
                 type=stem_type,
                 name=stem_name.title(),
                 url=s3_url,
@@ -252,14 +305,12 @@ def upload_stems(stem_files: List[str], version_id: str) -> List[StemInfo]:
                 checksum=f"sha256:{file_hash}"
             )
             
-            stem_infos.append(stem_info)
-            logger.info(f"Uploaded stem {stem_name} to {s3_url}")
-            
         except Exception as e:
             logger.error(f"Failed to upload stem {stem_path}: {e}")
             raise
     
-    return stem_infos
+    with ThreadPoolExecutor(max_workers=min(16, max(1, len(stem_files)))) as executor:
+        return list(executor.map(upload_one, stem_files))
 
 
 def get_audio_duration(audio_path: str) -> float:
@@ -284,23 +335,3 @@ def get_audio_duration(audio_path: str) -> float:
         logger.warning(f"Failed to get duration for {audio_path}: {e}")
         return 0.0
 
-
-def send_webhook(webhook_url: str, payload: WebhookPayload):
-    """Send webhook with HMAC signature."""
-    try:
-        payload_json = payload.model_dump_json()
-        headers = get_webhook_headers(payload_json)
-        
-        response = requests.post(
-            webhook_url,
-            data=payload_json,
-            headers=headers,
-            timeout=30
-        )
-        response.raise_for_status()
-        
-        logger.info(f"Successfully sent webhook to {webhook_url}")
-        
-    except Exception as e:
-        logger.error(f"Failed to send webhook to {webhook_url}: {e}")
-        raise
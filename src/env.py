@@ -1,5 +1,6 @@
 """Environment configuration using pydantic-settings."""
 
+from functools import lru_cache
 from typing import List
 from pydantic import Field
 from pydantic_settings import BaseSettings
@@ -9,7 +10,9 @@ class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
     # Server Configuration
+    env: str = Field(default="dev", description="Deployment environment (dev or prod)")
     port: int = Field(default=8080, description="Server port")
+    workers: int = Field(default=0, description="Uvicorn worker processes (0 = CPU count)")
     
     # Security
     demucssvc_token: str = Field(..., description="HMAC secret token for authentication")
@@ -32,6 +35,16 @@ class Settings(BaseSettings):
     
     # GPU Configuration
     cuda_visible_devices: str = Field(default="0", description="CUDA devices to use")
+
+    # Mock Runner Configuration
+    mock_processing_delay_ms: int = Field(
+        default=2000,
+        description="Simulated processing delay for the mock runner in milliseconds"
+    )
+    mock_fast: bool = Field(
+        default=False,
+        description="Skip the simulated mock delay entirely (MOCK_FAST=1 for load tests)"
+    )
     
     class Config:
         env_file = ".env"
@@ -39,5 +52,12 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the cached application settings.
+
+    Lazy instantiation avoids re-parsing .env and environment variables on
+    every import (e.g. per-fork Celery worker bootstrap) — the settings are
+    built once per process and reused.
+    """
+    return Settings()
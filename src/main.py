@@ -1,16 +1,26 @@
 """FastAPI application for track-tree-audio service."""
 
+import asyncio
 import logging
+import uuid
 from typing import Dict, Any
-from fastapi import FastAPI, HTTPException, Header, Depends
-from fastapi.responses import JSONResponse
 
-from .env import settings
+import redis.asyncio as aioredis
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Header, Depends, Request
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import ValidationError
+
+from .env import get_settings
 from .models import SplitRequest, SplitResponse, HealthResponse, QueueStatusResponse
 from .security import verify_hmac_signature, is_webhook_url_allowed
 from .queues import celery_app
-from .demucs_runner import process_audio_split
-from .mock_demucs_runner import mock_process_audio_split
+from .mock_demucs_runner import mock_process_audio_split, close_client, stop_webhook_flusher
+
+# Dispatched by name via send_task: importing src.demucs_runner here would
+# drag torch, demucs and boto3 into the API process just to enqueue a
+# message, adding seconds of startup per uvicorn worker. Must match the
+# task name registered in src.demucs_runner and routed in src.queues.
+PROCESS_AUDIO_SPLIT_TASK = "src.demucs_runner.process_audio_split"
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,10 +30,34 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Track Tree Audio Service",
     description="GPU microservice for audio stem separation using Demucs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 
+# Async Redis connection for O(1) queue-depth reads in /queue/status
+_redis: aioredis.Redis = None
+
+
+def get_redis() -> aioredis.Redis:
+    """Get the shared async Redis connection, creating it lazily."""
+    global _redis
+    if _redis is None:
+        _redis = aioredis.Redis.from_url(get_settings().redis_url)
+    return _redis
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the webhook flusher and close shared clients."""
+    global _redis
+    await stop_webhook_flusher()
+    await close_client()
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
 def verify_hmac_auth(x_signature: str = Header(..., alias="X-Signature")) -> str:
     """Dependency to verify HMAC authentication."""
     if not x_signature:
@@ -41,19 +75,15 @@ async def health_check():
 async def queue_status():
     """Get queue status and worker statistics."""
     try:
-        # Get queue statistics
-        inspect = celery_app.control.inspect()
-        active_tasks = inspect.active()
-        scheduled_tasks = inspect.scheduled()
-        
-        # Count active workers
-        active_workers = len(active_tasks) if active_tasks else 0
+        # Queue depth straight from Redis: O(1) LLEN instead of the
+        # broadcast inspect() RPC fan-out (1s timeout per call, per worker)
+        r = get_redis()
+        queue_depth = await r.llen("demucs_queue") + await r.llen("webhook_queue")
         
-        # Count pending tasks
-        queue_depth = 0
-        if scheduled_tasks:
-            for worker_tasks in scheduled_tasks.values():
-                queue_depth += len(worker_tasks)
+        # Worker count via a single lightweight ping, run in a thread so the
+        # broadcast timeout doesn't stall the event loop
+        replies = await asyncio.to_thread(celery_app.control.ping, timeout=0.25)
+        active_workers = len(replies) if replies else 0
         
         # Get completed/failed counts from result backend
         # Note: This is a simplified implementation
@@ -73,7 +103,8 @@ async def queue_status():
 
 @app.post("/split", response_model=SplitResponse)
 async def split_audio(
-    request: SplitRequest,
+    request: Request,
+    background_tasks: BackgroundTasks,
     x_signature: str = Depends(verify_hmac_auth)
 ):
     """
@@ -82,40 +113,64 @@ async def split_audio(
     Validates HMAC signature, enqueues job, and returns job ID.
     """
     try:
-        # Verify HMAC signature
-        request_body = request.model_dump_json()
-        if not verify_hmac_signature(request_body, x_signature):
+        # Verify HMAC over the exact bytes the client signed, then validate.
+        # Re-serializing the parsed model could produce different bytes
+        # (key order, whitespace) and costs an extra JSON pass.
+        body = await request.body()
+        try:
+            split = SplitRequest.model_validate_json(body)
+        except ValidationError as e:
+            # Strip input/url from the error dicts: for a non-JSON body the
+            # input field holds the raw request bytes, which JSONResponse
+            # cannot serialize (the 422 would turn into a 500)
+            raise HTTPException(
+                status_code=422,
+                detail=e.errors(include_url=False, include_input=False)
+            )
+
+        # Run the HMAC verify and the allow-list check concurrently in the
+        # thread pool so SHA-256 work overlaps any DNS/parse latency and
+        # neither blocks the event loop
+        hmac_ok, url_ok = await asyncio.gather(
+            asyncio.to_thread(verify_hmac_signature, body, x_signature),
+            asyncio.to_thread(is_webhook_url_allowed, split.callback_url)
+        )
+        if not hmac_ok:
             raise HTTPException(status_code=401, detail="Invalid HMAC signature")
-        
-        # Validate webhook URL
-        if not is_webhook_url_allowed(request.callback_url):
+        if not url_ok:
             raise HTTPException(status_code=400, detail="Webhook URL not allowed")
         
         # For development, use mock implementation
         # In production, this would use the real Demucs processing
-        if settings.demucssvc_token == "mock-token-for-development":
-            # Use mock implementation for development
-            import asyncio
-            result = asyncio.run(mock_process_audio_split(
-                version_id=request.version_id,
-                file_key=request.file_key,
-                stem_types=request.stem_types,
-                callback_url=request.callback_url,
-                correlation_id=request.correlation_id
-            ))
-            job_id = result["job_id"]
+        if get_settings().demucssvc_token == "mock-token-for-development":
+            # Use mock implementation for development.
+            # Run it as a background task so the endpoint returns immediately
+            # instead of blocking the event loop for the whole mock job.
+            job_id = str(uuid.uuid4())
+            background_tasks.add_task(
+                mock_process_audio_split,
+                version_id=split.version_id,
+                file_key=split.file_key,
+                stem_types=split.stem_types,
+                callback_url=split.callback_url,
+                correlation_id=split.correlation_id,
+                job_id=job_id
+            )
         else:
             # Use real Demucs processing
-            job = process_audio_split.delay(
-                version_id=request.version_id,
-                file_key=request.file_key,
-                stem_types=request.stem_types,
-                callback_url=request.callback_url,
-                correlation_id=request.correlation_id
+            job = celery_app.send_task(
+                PROCESS_AUDIO_SPLIT_TASK,
+                kwargs={
+                    "version_id": split.version_id,
+                    "file_key": split.file_key,
+                    "stem_types": split.stem_types,
+                    "callback_url": split.callback_url,
+                    "correlation_id": split.correlation_id
+                }
             )
             job_id = job.id
         
-        logger.info(f"Enqueued job {job_id} for version {request.version_id}")
+        logger.info(f"Enqueued job {job_id} for version {split.version_id}")
         
         return SplitResponse(job_id=job_id)
         
@@ -137,10 +192,25 @@ async def global_exception_handler(request, exc):
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(
-        "src.main:app",
-        host="0.0.0.0",
-        port=settings.port,
-        reload=True
-    )
+    settings = get_settings()
+    if settings.env == "dev":
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=settings.port,
+            reload=True
+        )
+    else:
+        # Prod serving: one worker per core with uvloop/httptools so the
+        # HMAC + JSON-parse CPU path scales across cores
+        uvicorn.run(
+            "src.main:app",
+            host="0.0.0.0",
+            port=settings.port,
+            workers=settings.workers or os.cpu_count(),
+            loop="uvloop",
+            http="httptools",
+            access_log=False
+        )
@@ -4,7 +4,7 @@ import logging
 from fastapi import FastAPI, HTTPException, Header, Depends
 from fastapi.responses import JSONResponse
 
-from .env import settings
+from .env import get_settings
 from .models import SplitRequest, SplitResponse, HealthResponse
 from .security import verify_hmac_signature, is_webhook_url_allowed
 
@@ -50,7 +50,7 @@ async def split_audio(
             raise HTTPException(status_code=401, detail="Invalid HMAC signature")
         
         # Validate webhook URL
-        if not is_webhook_url_allowed(request.webhook):
+        if not is_webhook_url_allowed(request.callback_url):
             raise HTTPException(status_code=400, detail="Webhook URL not allowed")
         
         # For now, just return a mock job ID
@@ -68,10 +68,25 @@ async def split_audio(
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(
-        "src.main_simple:app",
-        host="0.0.0.0",
-        port=settings.port,
-        reload=True
-    )
+    settings = get_settings()
+    if settings.env == "dev":
+        uvicorn.run(
+            "src.main_simple:app",
+            host="0.0.0.0",
+            port=settings.port,
+            reload=True
+        )
+    else:
+        # Prod serving: one worker per core with uvloop/httptools so the
+        # HMAC + JSON-parse CPU path scales across cores
+        uvicorn.run(
+            "src.main_simple:app",
+            host="0.0.0.0",
+            port=settings.port,
+            workers=settings.workers or os.cpu_count(),
+            loop="uvloop",
+            http="httptools",
+            access_log=False
+        )
@@ -1,14 +1,139 @@
 """Mock Demucs runner for testing and development."""
 
 import asyncio
-import json
+import logging
+import os
 import time
 import uuid
 from typing import List, Dict, Any
 import httpx
+import orjson
+from .env import get_settings
 from .models import WebhookPayload, StemInfo
 from .security import get_webhook_headers
-from .env import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared HTTP client so webhook POSTs reuse pooled connections instead of
+# paying a TCP/TLS handshake per job.
+_CLIENT: httpx.AsyncClient = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared webhook HTTP client, creating it lazily."""
+    global _CLIENT
+    if _CLIENT is None:
+        limits = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+        _CLIENT = httpx.AsyncClient(
+            timeout=30.0,
+            limits=limits,
+            # Transport-level retries cover connect failures before the
+            # request is sent; 5xx retries are handled in _post_with_retry
+            transport=httpx.AsyncHTTPTransport(retries=3, limits=limits)
+        )
+    return _CLIENT
+
+
+async def close_client():
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+def _mock_processing_delay() -> float:
+    """Simulated processing delay in seconds, 0 when MOCK_FAST is set."""
+    settings = get_settings()
+    if settings.mock_fast:
+        return 0.0
+    return settings.mock_processing_delay_ms / 1000.0
+
+
+# Webhook micro-batching: completed jobs enqueue their payloads and a single
+# flusher coroutine drains up to _MAX_BATCH_SIZE of them (or whatever arrived
+# within _BATCH_INTERVAL seconds), then POSTs one request per callback URL.
+_MAX_BATCH_SIZE = 32
+_BATCH_INTERVAL = 0.05  # seconds
+_WEBHOOK_Q: asyncio.Queue = None
+_FLUSHER_TASK: asyncio.Task = None
+
+
+async def enqueue_webhook(callback_url: str, payload_json: bytes):
+    """Queue a serialized webhook payload for batched delivery."""
+    global _WEBHOOK_Q, _FLUSHER_TASK
+    if _WEBHOOK_Q is None:
+        _WEBHOOK_Q = asyncio.Queue()
+    if _FLUSHER_TASK is None or _FLUSHER_TASK.done():
+        _FLUSHER_TASK = asyncio.get_running_loop().create_task(_webhook_flusher())
+    await _WEBHOOK_Q.put((callback_url, payload_json))
+
+
+async def stop_webhook_flusher():
+    """Stop the flusher task (called on app shutdown)."""
+    global _FLUSHER_TASK
+    if _FLUSHER_TASK is not None:
+        _FLUSHER_TASK.cancel()
+        _FLUSHER_TASK = None
+
+
+async def _post_with_retry(callback_url: str, body: bytes, max_attempts: int = 5) -> httpx.Response:
+    """POST a webhook body, retrying transient failures with backoff.
+
+    Retries httpx transport errors and 5xx responses with exponential
+    backoff through the shared pooled client. Raises the last transport
+    error if all attempts fail.
+    """
+    last_error = None
+    response = None
+    for attempt in range(max_attempts):
+        if attempt > 0:
+            await asyncio.sleep(2 ** attempt * 0.2)
+        try:
+            headers = get_webhook_headers(body)
+            response = await get_client().post(callback_url, content=body, headers=headers)
+        except httpx.TransportError as e:
+            last_error = e
+            continue
+        if response.status_code < 500:
+            return response
+    if response is not None:
+        return response
+    raise last_error
+
+
+async def _webhook_flusher():
+    """Drain queued webhook payloads and POST them in per-URL batches."""
+    while True:
+        batch = [await _WEBHOOK_Q.get()]
+        deadline = time.monotonic() + _BATCH_INTERVAL
+        while len(batch) < _MAX_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_WEBHOOK_Q.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Group by destination so only same-host payloads batch together
+        by_url = {}
+        for callback_url, payload_json in batch:
+            by_url.setdefault(callback_url, []).append(payload_json)
+
+        for callback_url, payloads in by_url.items():
+            if len(payloads) == 1:
+                body = payloads[0]
+            else:
+                body = b'{"batch":[' + b','.join(payloads) + b']}'
+            try:
+                response = await _post_with_retry(callback_url, body)
+                if response.status_code == 200:
+                    logger.info("Mock Demucs: delivered %d webhook(s) to %s", len(payloads), callback_url)
+                else:
+                    logger.warning("Mock Demucs: webhook batch failed with status %d", response.status_code)
+            except Exception as e:
+                logger.error("Mock Demucs: failed to send webhook batch: %s", e)
 
 
 async def mock_process_audio_split(
@@ -16,39 +141,50 @@ async def mock_process_audio_split(
     file_key: str,
     stem_types: List[str],
     callback_url: str,
-    correlation_id: str = None
+    correlation_id: str = None,
+    job_id: str = None
 ) -> Dict[str, Any]:
     """
     Mock implementation of audio stem separation.
-    
+
     This simulates the Demucs processing by:
     1. Waiting for a simulated processing time
     2. Generating mock stem files
     3. Calling the webhook with results
+
+    The caller may pass a pre-generated job_id so it can be returned to the
+    client before this coroutine runs (e.g. from a background task).
     """
-    
-    job_id = str(uuid.uuid4())
+
+    # One urandom draw covers the job id plus a 4-byte checksum suffix per
+    # stem, replacing N+1 uuid4() calls (and their syscalls) with slicing
+    rand = os.urandom(16 + 4 * len(stem_types))
+    if job_id is None:
+        job_id = str(uuid.UUID(bytes=rand[:16], version=4))
     start_time = time.time()
     
-    print(f"🎵 Mock Demucs: Starting job {job_id} for version {version_id}")
-    print(f"   File: {file_key}")
-    print(f"   Stem types: {stem_types}")
-    print(f"   Callback: {callback_url}")
+    logger.info(
+        "Mock Demucs: starting job %s for version %s (file=%s, stems=%s, callback=%s)",
+        job_id, version_id, file_key, stem_types, callback_url
+    )
     
-    # Simulate processing time (1-5 seconds for demo)
-    processing_delay = min(5, max(1, len(stem_types) * 1.5))
-    await asyncio.sleep(processing_delay)
+    # Simulate processing time; MOCK_FAST=1 skips the sleep entirely so load
+    # tests measure the HTTP/HMAC/webhook stack instead of an artificial delay
+    processing_delay = _mock_processing_delay()
+    if processing_delay:
+        await asyncio.sleep(processing_delay)
     
     # Generate mock stems
     mock_stems = []
-    for stem_type in stem_types:
+    for i, stem_type in enumerate(stem_types):
+        suffix = rand[16 + 4 * i:20 + 4 * i].hex()
         stem_info = StemInfo(
             type=stem_type,
             name=f"{stem_type.title()} Track",
             url=f"s3://mock-bucket/stems/{version_id}/{stem_type}.wav",
             size=1024 * 1024 * 2,  # 2MB mock file
             duration=180.0,  # 3 minutes
-            checksum=f"mock-checksum-{stem_type}-{uuid.uuid4().hex[:8]}"
+            checksum=f"mock-checksum-{stem_type}-{suffix}"
         )
         mock_stems.append(stem_info)
     
@@ -62,57 +198,23 @@ async def mock_process_audio_split(
         processing_time=processing_time_ms
     )
     
-    # Send webhook
-    try:
-        payload_json = webhook_payload.model_dump_json()
-        headers = get_webhook_headers(payload_json)
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                callback_url,
-                content=payload_json,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                print(f"✅ Mock Demucs: Job {job_id} completed successfully")
-                print(f"   Generated {len(mock_stems)} stems")
-                print(f"   Processing time: {processing_time_ms}ms")
-            else:
-                print(f"❌ Mock Demucs: Webhook failed with status {response.status_code}")
-                print(f"   Response: {response.text}")
-                
-    except Exception as e:
-        print(f"❌ Mock Demucs: Failed to send webhook: {e}")
-        
-        # Send failure webhook
-        try:
-            failure_payload = WebhookPayload(
-                job_id=job_id,
-                status="failed",
-                stems=[],
-                error=f"Webhook delivery failed: {str(e)}",
-                processing_time=processing_time_ms
-            )
-            
-            payload_json = failure_payload.model_dump_json()
-            headers = get_webhook_headers(payload_json)
-            
-            async with httpx.AsyncClient() as client:
-                await client.post(
-                    callback_url,
-                    content=payload_json,
-                    headers=headers,
-                    timeout=30.0
-                )
-        except Exception as webhook_error:
-            print(f"❌ Mock Demucs: Failed to send failure webhook: {webhook_error}")
-    
+    # Serialize once: the same dump feeds the webhook body and the return
+    # value instead of re-running Pydantic's serializer per consumer
+    payload_dict = webhook_payload.model_dump(mode="json")
+    payload_json = orjson.dumps(payload_dict)
+
+    # Queue webhook for batched delivery; the flusher POSTs per-URL batches
+    await enqueue_webhook(callback_url, payload_json)
+
+    logger.info(
+        "Mock Demucs: job %s completed, webhook queued (%d stems, %dms)",
+        job_id, len(mock_stems), processing_time_ms
+    )
+
     return {
         "job_id": job_id,
         "status": "completed",
-        "stems": [stem.model_dump() for stem in mock_stems],
+        "stems": payload_dict["stems"],
         "processing_time": processing_time_ms
     }
 
@@ -132,11 +234,15 @@ async def mock_process_audio_split_failure(
     job_id = str(uuid.uuid4())
     start_time = time.time()
     
-    print(f"🎵 Mock Demucs: Starting FAILING job {job_id} for version {version_id}")
-    print(f"   Error: {error_message}")
+    logger.info(
+        "Mock Demucs: starting failing job %s for version %s (error=%s)",
+        job_id, version_id, error_message
+    )
     
     # Simulate processing time before failure
-    await asyncio.sleep(2)
+    processing_delay = _mock_processing_delay()
+    if processing_delay:
+        await asyncio.sleep(processing_delay)
     
     processing_time_ms = int((time.time() - start_time) * 1000)
     
@@ -149,26 +255,11 @@ async def mock_process_audio_split_failure(
         processing_time=processing_time_ms
     )
     
-    # Send failure webhook
-    try:
-        payload_json = webhook_payload.model_dump_json()
-        headers = get_webhook_headers(payload_json)
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                callback_url,
-                content=payload_json,
-                headers=headers,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                print(f"❌ Mock Demucs: Job {job_id} failed as expected")
-            else:
-                print(f"❌ Mock Demucs: Failure webhook failed with status {response.status_code}")
-                
-    except Exception as e:
-        print(f"❌ Mock Demucs: Failed to send failure webhook: {e}")
+    # Queue failure webhook for batched delivery
+    payload_json = orjson.dumps(webhook_payload.model_dump(mode="json"))
+    await enqueue_webhook(callback_url, payload_json)
+
+    logger.info("Mock Demucs: job %s failed as expected, webhook queued", job_id)
     
     return {
         "job_id": job_id,
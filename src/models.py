@@ -1,12 +1,26 @@
 """Pydantic models for request/response validation."""
 
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
+__all__ = [
+    "SplitRequest",
+    "SplitResponse",
+    "StemInfo",
+    "WebhookPayload",
+    "HealthResponse",
+    "QueueStatusResponse",
+]
+
 
 class SplitRequest(BaseModel):
     """Request model for /split endpoint."""
+
+    # Hot path: ignore unknown keys, freeze instances (no per-field
+    # mutation machinery, hashable)
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     version_id: str = Field(..., description="Unique version identifier")
     file_key: str = Field(..., description="S3/R2 object key for the audio file")
     stem_types: list[str] = Field(..., description="List of stem types to extract")
@@ -23,6 +37,9 @@ class SplitResponse(BaseModel):
 
 class StemInfo(BaseModel):
     """Information about a separated audio stem."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     type: str = Field(..., description="Stem type (e.g., 'drums', 'bass', 'other', 'vocals')")
     name: str = Field(..., description="Human-readable stem name")
     url: str = Field(..., description="S3/R2 URL where stem is stored")
@@ -33,6 +50,9 @@ class StemInfo(BaseModel):
 
 class WebhookPayload(BaseModel):
     """Payload sent to webhook on job completion."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     job_id: str = Field(..., description="Job identifier")
     status: Literal["completed", "failed"] = Field(..., description="Job status")
     stems: List[StemInfo] = Field(default_factory=list, description="Generated stems")
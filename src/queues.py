@@ -1,14 +1,16 @@
 """Celery configuration and task definitions."""
 
 from celery import Celery
-from .env import settings
+from .env import get_settings
+
+settings = get_settings()
 
 # Initialize Celery app
 celery_app = Celery(
     "track_tree_audio",
     broker=settings.redis_url,
     backend=settings.redis_url,
-    include=["src.demucs_runner"]
+    include=["src.demucs_runner", "src.webhook"]
 )
 
 # Celery configuration
@@ -27,9 +29,17 @@ celery_app.conf.update(
     task_reject_on_worker_lost=True,
     task_ignore_result=False,
     result_expires=3600,  # 1 hour
+    # Compress task/result payloads (stem lists + checksums) through Redis
+    result_compression="gzip",
+    task_compression="gzip",
+    result_backend_transport_options={"retry_policy": {"timeout": 5.0}},
 )
 
 # Task routing
+# prefetch_multiplier=1 is right for long GPU tasks but starves short
+# IO-bound ones, so webhook delivery gets its own queue; its worker should
+# be started with a higher --prefetch-multiplier (see start.sh).
 celery_app.conf.task_routes = {
     "src.demucs_runner.process_audio_split": {"queue": "demucs_queue"},
+    "src.webhook.deliver_webhook": {"queue": "webhook_queue"},
 }
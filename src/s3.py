@@ -2,45 +2,121 @@
 
 import os
 import logging
+import threading
+from functools import lru_cache
 from typing import Optional
 import boto3
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
+from celery.signals import worker_process_init
 
-from .env import settings
+from .env import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+@worker_process_init.connect
+def _reset_s3_client(**kwargs):
+    """Drop the cached client and transfer manager in forked Celery workers.
+
+    A client inherited from the parent would share its connection pool
+    across processes; each fork builds its own on first use.
+    """
+    global _CLIENT, _TRANSFER_MANAGER
+    _CLIENT = None
+    _TRANSFER_MANAGER = None
+
+# Concurrent multipart settings for stem uploads. Real Demucs stems run
+# 30-100 MB each, so parallel part-PUTs matter; built once at module scope.
+# The 8 MB threshold lets even short stems overlap their first parts with
+# the rest of the batch, 16 MB parts keep the part count low on
+# higher-latency links, and the 1 MB io_chunksize cuts read-buffer
+# syscalls versus the 256 KB default.
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+    io_chunksize=1024 * 1024
+)
+
+
+# One client and one TransferManager per process, shared by every upload
+# thread — both are documented thread-safe, and the upload threads are
+# short-lived (one per stem batch), so anything cached per thread would be
+# rebuilt every job. The 64-slot pool below keeps concurrent part-PUTs
+# from contending for connections.
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_TRANSFER_MANAGER = None
+
+_CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+    # Pinned so botocore never renegotiates the auth scheme against the
+    # endpoint; SigV4 is what both S3 and R2 expect
+    signature_version="s3v4",
+    # Keep idle pool connections alive so bursts after a quiet period
+    # reuse warm sockets instead of re-running the TLS handshake
+    tcp_keepalive=True
+)
+
+
 def get_s3_client():
-    """Get configured S3 client."""
+    """Get the shared S3 client, creating it once per process.
+
+    Client construction parses botocore service definitions and resolves
+    credentials — far too expensive to repeat per upload — and the client
+    is thread-safe, so one instance serves every upload thread.
+    """
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
+
+    settings = get_settings()
     try:
+        kwargs = {
+            "endpoint_url": settings.s3_endpoint if settings.s3_endpoint else None,
+            "region_name": settings.s3_region,
+            "config": _CLIENT_CONFIG,
+        }
         if settings.s3_access_key_id and settings.s3_secret_access_key:
             # Use provided credentials
-            client = boto3.client(
-                's3',
-                endpoint_url=settings.s3_endpoint if settings.s3_endpoint else None,
-                region_name=settings.s3_region,
-                aws_access_key_id=settings.s3_access_key_id,
-                aws_secret_access_key=settings.s3_secret_access_key
-            )
-        else:
-            # Use default credentials (IAM role, environment, etc.)
-            client = boto3.client(
-                's3',
-                endpoint_url=settings.s3_endpoint if settings.s3_endpoint else None,
-                region_name=settings.s3_region
-            )
-        
-        return client
-        
+            kwargs["aws_access_key_id"] = settings.s3_access_key_id
+            kwargs["aws_secret_access_key"] = settings.s3_secret_access_key
+        # Otherwise fall back to default credentials (IAM role, environment, etc.)
+
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = boto3.session.Session().client('s3', **kwargs)
+        return _CLIENT
+
     except NoCredentialsError:
         logger.error("No AWS credentials found")
         raise
     except Exception as e:
-        logger.error(f"Failed to create S3 client: {e}")
+        logger.error("Failed to create S3 client: %s", e)
         raise
 
 
+def get_transfer_manager():
+    """Get the shared TransferManager, creating it once per process.
+
+    upload_file with a per-call Config spins up (and tears down) a fresh
+    TransferManager — thread pool included — on every invocation; the
+    manager is thread-safe, so one instance keeps its executors warm
+    across every stem upload in the process.
+    """
+    global _TRANSFER_MANAGER
+    if _TRANSFER_MANAGER is None:
+        client = get_s3_client()
+        with _CLIENT_LOCK:
+            if _TRANSFER_MANAGER is None:
+                _TRANSFER_MANAGER = create_transfer_manager(client, _TRANSFER_CONFIG)
+    return _TRANSFER_MANAGER
+
+
 def upload_to_s3(file_path: str, s3_key: str, bucket: Optional[str] = None) -> str:
     """
     Upload file to S3/R2.
@@ -54,36 +130,42 @@ def upload_to_s3(file_path: str, s3_key: str, bucket: Optional[str] = None) -> s
         S3 URL of uploaded file
     """
     if not bucket:
-        bucket = settings.s3_bucket
+        bucket = get_settings().s3_bucket
     
     if not bucket:
         raise ValueError("S3 bucket not configured")
     
     try:
-        s3_client = get_s3_client()
-        
-        # Upload file
-        s3_client.upload_file(file_path, bucket, s3_key)
-        
-        # Construct URL
-        if settings.s3_endpoint:
-            # Custom endpoint (e.g., R2)
-            url = f"{settings.s3_endpoint.rstrip('/')}/{bucket}/{s3_key}"
-        else:
-            # Standard S3
-            url = f"https://{bucket}.s3.{settings.s3_region}.amazonaws.com/{s3_key}"
-        
-        logger.info(f"Uploaded {file_path} to {url}")
+        # Upload through the shared manager: concurrent multipart for
+        # large stems without a fresh thread pool per call
+        get_transfer_manager().upload(file_path, bucket, s3_key).result()
+
+        url = f"{_bucket_base_url(bucket)}/{s3_key}"
+
+        logger.info("Uploaded %s to %s", file_path, url)
         return url
         
     except ClientError as e:
-        logger.error(f"S3 upload failed: {e}")
+        logger.error("S3 upload failed: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Failed to upload to S3: {e}")
+        logger.error("Failed to upload to S3: %s", e)
         raise
 
 
+@lru_cache(maxsize=4)
+def _bucket_base_url(bucket: str) -> str:
+    """Base public URL for a bucket, computed once per bucket.
+
+    Custom endpoints (e.g. R2) take precedence over the standard
+    virtual-hosted S3 form.
+    """
+    settings = get_settings()
+    if settings.s3_endpoint:
+        return f"{settings.s3_endpoint.rstrip('/')}/{bucket}"
+    return f"https://{bucket}.s3.{settings.s3_region}.amazonaws.com"
+
+
 def generate_presigned_put_url(s3_key: str, bucket: Optional[str] = None, expires_in: int = 3600) -> str:
     """
     Generate presigned PUT URL for direct upload.
@@ -97,7 +179,7 @@ def generate_presigned_put_url(s3_key: str, bucket: Optional[str] = None, expire
         Presigned PUT URL
     """
     if not bucket:
-        bucket = settings.s3_bucket
+        bucket = get_settings().s3_bucket
     
     if not bucket:
         raise ValueError("S3 bucket not configured")
@@ -112,28 +194,77 @@ def generate_presigned_put_url(s3_key: str, bucket: Optional[str] = None, expire
             ExpiresIn=expires_in
         )
         
-        logger.info(f"Generated presigned PUT URL for {s3_key}")
+        logger.info("Generated presigned PUT URL for %s", s3_key)
         return url
         
     except ClientError as e:
-        logger.error(f"Failed to generate presigned URL: {e}")
+        logger.error("Failed to generate presigned URL: %s", e)
         raise
     except Exception as e:
-        logger.error(f"Failed to generate presigned URL: {e}")
+        logger.error("Failed to generate presigned URL: %s", e)
         raise
 
 
-def test_s3_connection() -> bool:
-    """Test S3 connection and permissions."""
+def generate_presigned_get_url(s3_key: str, bucket: Optional[str] = None, expires_in: int = 3600) -> str:
+    """
+    Generate presigned GET URL for downloading an object.
+    
+    Args:
+        s3_key: S3 object key
+        bucket: S3 bucket name (uses settings.s3_bucket if not provided)
+        expires_in: URL expiration time in seconds
+        
+    Returns:
+        Presigned GET URL
+    """
+    if not bucket:
+        bucket = get_settings().s3_bucket
+    
+    if not bucket:
+        raise ValueError("S3 bucket not configured")
+    
     try:
         s3_client = get_s3_client()
         
-        # Try to list objects in bucket
-        s3_client.list_objects_v2(Bucket=settings.s3_bucket, MaxKeys=1)
+        # Generate presigned GET URL
+        url = s3_client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': bucket, 'Key': s3_key},
+            ExpiresIn=expires_in
+        )
+        
+        logger.info("Generated presigned GET URL for %s", s3_key)
+        return url
         
+    except ClientError as e:
+        logger.error("Failed to generate presigned URL: %s", e)
+        raise
+    except Exception as e:
+        logger.error("Failed to generate presigned URL: %s", e)
+        raise
+
+
+# Set after the first successful connectivity check; repeat calls (e.g.
+# per-request health probes) then skip the network round-trip entirely.
+_S3_CONNECTION_OK = False
+
+
+def test_s3_connection() -> bool:
+    """Test S3 connection and permissions."""
+    global _S3_CONNECTION_OK
+    if _S3_CONNECTION_OK:
+        return True
+
+    try:
+        s3_client = get_s3_client()
+
+        # HEAD on the bucket is the cheapest reachability/permission probe
+        s3_client.head_bucket(Bucket=get_settings().s3_bucket)
+
         logger.info("S3 connection test successful")
+        _S3_CONNECTION_OK = True
         return True
-        
+
     except Exception as e:
-        logger.error(f"S3 connection test failed: {e}")
+        logger.error("S3 connection test failed: %s", e)
         return False
@@ -3,43 +3,76 @@
 import hmac
 import hashlib
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
 from urllib.parse import urlparse
 
-from .env import settings
+from .env import get_settings
 
+# HMAC template initialized once with the shared secret; per-request
+# signatures .copy() it instead of re-running the key schedule every call.
+# The algorithm stays HMAC-SHA256: the "sha256=<hex>" header is a wire
+# contract with track-tree-api, so a keyed blake2b (faster for short
+# messages) would break every existing signer/verifier. CPython's
+# hashlib.sha256 is OpenSSL-backed and uses SHA-NI where available.
+_HMAC_TEMPLATE: Optional[hmac.HMAC] = None
 
-def verify_hmac_signature(payload: str, signature: str, timestamp: Optional[str] = None) -> bool:
+
+def _get_hmac_template() -> hmac.HMAC:
+    """Get the keyed HMAC template, creating it on first use."""
+    global _HMAC_TEMPLATE
+    if _HMAC_TEMPLATE is None:
+        _HMAC_TEMPLATE = hmac.new(
+            get_settings().demucssvc_token.encode('utf-8'),
+            digestmod=hashlib.sha256
+        )
+    return _HMAC_TEMPLATE
+
+
+def reset_security_caches():
+    """Drop the cached HMAC template and parsed allowlist.
+
+    For tests (or anything else) that swap settings after this module has
+    signed or checked something — the caches key off process-constant
+    settings and won't notice the change on their own.
+    """
+    global _HMAC_TEMPLATE
+    _HMAC_TEMPLATE = None
+    _parsed_allowlist.cache_clear()
+
+
+def verify_hmac_signature(payload: Union[str, bytes], signature: str, timestamp: Optional[str] = None) -> bool:
     """
     Verify HMAC signature for incoming requests.
     
     Args:
-        payload: The request body as string
+        payload: The request body as string or bytes
         signature: The X-Signature header value (format: sha256=<hex>)
         timestamp: Optional timestamp for replay attack prevention
         
     Returns:
         True if signature is valid, False otherwise
     """
-    if not signature.startswith("sha256="):
-        return False
-    
-    # Extract the hex signature
-    received_signature = signature[7:]  # Remove "sha256=" prefix
-    
-    # Create expected signature
+    # Always compute the expected signature — no early exit on a bad
+    # prefix, so the function's cost (and timing) is uniform for any input
     expected_signature = create_hmac_signature(payload, timestamp)
-    
-    # Use constant-time comparison to prevent timing attacks
-    return hmac.compare_digest(received_signature, expected_signature)
 
+    # Constant-time comparison of both the "sha256=" prefix and the digest.
+    # Compared as bytes: compare_digest raises on non-ASCII str input, and
+    # a malformed header must fail verification, not error out.
+    signature_bytes = signature.encode('utf-8', 'replace')
+    prefix_ok = hmac.compare_digest(signature_bytes[:7], b"sha256=")
+    digest_ok = hmac.compare_digest(signature_bytes[7:], expected_signature.encode('ascii'))
+
+    return prefix_ok and digest_ok
 
-def create_hmac_signature(payload: str, timestamp: Optional[str] = None) -> str:
+
+def create_hmac_signature(payload: Union[str, bytes], timestamp: Optional[str] = None) -> str:
     """
     Create HMAC signature for outgoing webhooks.
     
     Args:
-        payload: The payload to sign
+        payload: The payload to sign, as string or bytes
         timestamp: Optional timestamp to include in signature
         
     Returns:
@@ -49,17 +82,18 @@ def create_hmac_signature(payload: str, timestamp: Optional[str] = None) -> str:
     if timestamp is None:
         timestamp = str(int(time.time()))
     
-    # Create message to sign (payload + timestamp)
-    message = f"{payload}|{timestamp}"
-    
-    # Create HMAC signature
-    signature = hmac.new(
-        settings.demucssvc_token.encode('utf-8'),
-        message.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
     
-    return signature
+    # Sign (payload + "|" + timestamp) using a copy of the pre-keyed
+    # template; feeding the parts incrementally avoids materializing a
+    # payload-sized concatenated copy just to hash it
+    mac = _get_hmac_template().copy()
+    mac.update(payload)
+    mac.update(b"|")
+    mac.update(timestamp.encode('utf-8'))
+
+    return mac.hexdigest()
 
 
 def is_webhook_url_allowed(webhook_url: str) -> bool:
@@ -76,26 +110,39 @@ def is_webhook_url_allowed(webhook_url: str) -> bool:
         parsed_url = urlparse(webhook_url)
         if not parsed_url.scheme or not parsed_url.netloc:
             return False
-        
-        # Check against allowlist
-        for allowed_url in settings.api_webhook_url_allowlist:
-            allowed_parsed = urlparse(allowed_url)
-            if (parsed_url.scheme == allowed_parsed.scheme and 
-                parsed_url.netloc == allowed_parsed.netloc and
-                parsed_url.path.startswith(allowed_parsed.path)):
+
+        # Check against the pre-parsed allowlist
+        for scheme, netloc, path in _parsed_allowlist(tuple(get_settings().api_webhook_url_allowlist)):
+            if (parsed_url.scheme == scheme and
+                parsed_url.netloc == netloc and
+                parsed_url.path.startswith(path)):
                 return True
-        
+
         return False
     except Exception:
         return False
 
 
-def get_webhook_headers(payload: str, timestamp: Optional[str] = None) -> dict:
+@lru_cache(maxsize=1)
+def _parsed_allowlist(allowlist: tuple) -> tuple:
+    """Parse the allowlist once into (scheme, netloc, path) triples.
+
+    urlparse is pure Python; re-parsing every entry per request is
+    measurable on the auth hot path, and the allowlist never changes
+    after startup.
+    """
+    return tuple(
+        (parsed.scheme, parsed.netloc, parsed.path)
+        for parsed in (urlparse(url) for url in allowlist)
+    )
+
+
+def get_webhook_headers(payload: Union[str, bytes], timestamp: Optional[str] = None) -> dict:
     """
     Get headers for webhook requests including HMAC signature.
     
     Args:
-        payload: The webhook payload
+        payload: The webhook payload, as string or bytes
         timestamp: Optional timestamp
         
     Returns:
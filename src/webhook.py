@@ -1,14 +1,59 @@
 """Webhook utilities for sending callbacks to the API."""
 
 import logging
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
+from urllib3.util.retry import Retry
 
 from .models import WebhookPayload
 from .security import get_webhook_headers
+from .queues import celery_app
 
 logger = logging.getLogger(__name__)
 
+# Shared session so webhook POSTs reuse keep-alive connections and TLS
+# session tickets instead of handshaking per call. The mounted adapter
+# retries transient 5xx with backoff at the transport level.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        status_forcelist=[500, 502, 503, 504],
+        allowed_methods=frozenset(["POST"])
+    )
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+
+@celery_app.task(bind=True, name="src.webhook.deliver_webhook", max_retries=5)
+def deliver_webhook(self, webhook_url: str, payload: dict) -> bool:
+    """
+    Celery task for webhook delivery.
+
+    Routed to webhook_queue so short IO-bound deliveries don't occupy the
+    GPU workers on demucs_queue. Failed deliveries are re-enqueued with an
+    exponential countdown (1s, 2s, 4s, ...), so the worker yields between
+    attempts instead of sleeping in-process.
+
+    Args:
+        webhook_url: URL to send webhook to
+        payload: Webhook payload as a JSON-serializable dict
+
+    Returns:
+        True if successful
+    """
+    if not send_webhook(webhook_url, WebhookPayload(**payload)):
+        # retry_backoff only applies under autoretry_for; an explicit
+        # retry() needs its countdown computed from the attempt number
+        raise self.retry(countdown=2 ** self.request.retries)
+    return True
+
 
 def send_webhook(webhook_url: str, payload: WebhookPayload, timeout: int = 30) -> bool:
     """
@@ -23,32 +68,34 @@ def send_webhook(webhook_url: str, payload: WebhookPayload, timeout: int = 30) -
         True if successful, False otherwise
     """
     try:
-        payload_json = payload.model_dump_json()
-        headers = get_webhook_headers(payload_json)
-        
-        logger.info(f"Sending webhook to {webhook_url}")
-        logger.debug(f"Webhook payload: {payload_json}")
-        
-        response = requests.post(
+        # orjson emits bytes directly, which feed the HMAC and the POST
+        # body without the str->bytes round-trip of model_dump_json
+        payload_bytes = orjson.dumps(payload.model_dump(mode="json"))
+        headers = get_webhook_headers(payload_bytes)
+
+        logger.info("Sending webhook to %s", webhook_url)
+        logger.debug("Webhook payload: %s", payload_bytes)
+
+        response = _SESSION.post(
             webhook_url,
-            data=payload_json,
+            data=payload_bytes,
             headers=headers,
             timeout=timeout
         )
         
         response.raise_for_status()
         
-        logger.info(f"Webhook sent successfully to {webhook_url}")
+        logger.info("Webhook sent successfully to %s", webhook_url)
         return True
         
     except requests.exceptions.Timeout:
-        logger.error(f"Webhook timeout to {webhook_url}")
+        logger.error("Webhook timeout to %s", webhook_url)
         return False
     except requests.exceptions.RequestException as e:
-        logger.error(f"Webhook request failed to {webhook_url}: {e}")
+        logger.error("Webhook request failed to %s: %s", webhook_url, e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error sending webhook to {webhook_url}: {e}")
+        logger.error("Unexpected error sending webhook to %s: %s", webhook_url, e)
         return False
 
 
@@ -75,14 +122,14 @@ def send_webhook_with_retry(
             # Exponential backoff
             import time
             delay = 2 ** attempt
-            logger.info(f"Retrying webhook in {delay} seconds (attempt {attempt + 1}/{max_retries + 1})")
+            logger.info("Retrying webhook in %s seconds (attempt %s/%s)", delay, attempt + 1, max_retries + 1)
             time.sleep(delay)
         
         if send_webhook(webhook_url, payload, timeout):
             return True
         
         if attempt == max_retries:
-            logger.error(f"Failed to send webhook after {max_retries + 1} attempts")
+            logger.error("Failed to send webhook after %s attempts", max_retries + 1)
             return False
     
     return False
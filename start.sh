@@ -22,9 +22,12 @@ if ! redis-cli ping > /dev/null 2>&1; then
     exit 1
 fi
 
-# Start Celery worker in background
-echo "Starting Celery worker..."
-celery -A src.queues worker --loglevel=info --detach
+# Start Celery workers in background
+echo "Starting Celery workers..."
+# GPU tasks stay on prefork; webhook deliveries are pure I/O, so a gevent
+# pool lets one process hold hundreds of in-flight POSTs
+celery -A src.queues worker --loglevel=info --detach -Q demucs_queue --pool=prefork -c 1
+celery -A src.queues worker --loglevel=info --detach -Q webhook_queue --pool=gevent -c 200 --prefetch-multiplier=16 -n webhook@%h
 
 # Wait a moment for worker to start
 sleep 2
@@ -43,9 +43,9 @@ def test_models():
     # Test SplitRequest
     request = SplitRequest(
         version_id="test-123",
-        audio_url="https://example.com/audio.wav",
-        ai_model="htdemucs",
-        webhook="https://api.track-tree.com/webhooks/demucs"
+        file_key="audio/test-123/input.wav",
+        stem_types=["drums", "bass", "other", "vocals"],
+        callback_url="https://api.track-tree.com/webhooks/demucs"
     )
     assert request.version_id == "test-123"
     